@@ -2,8 +2,11 @@
 API routes for the Video RAG system.
 Defines all REST endpoints.
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
+import asyncio
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 
 from api.models import (
     VideoProcessRequest,
@@ -17,29 +20,74 @@ from api.models import (
 )
 from services.video_service import VideoRAGService
 
-# Create router
-router = APIRouter()
+# Create router (responses are encoded with orjson)
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Get service instance (singleton)
 video_service = VideoRAGService()
 
+# Request bodies are validated straight from the raw JSON bytes.
+_VIDEO_PROCESS_ADAPTER = TypeAdapter(VideoProcessRequest)
+_CHAT_ADAPTER = TypeAdapter(ChatRequest)
+_SEARCH_ADAPTER = TypeAdapter(SearchRequest)
 
-@router.post("/video/process", response_model=VideoProcessResponse)
-async def process_video(request: VideoProcessRequest):
+
+def _json_body(model) -> dict:
+    """OpenAPI request body for a handler that parses its own body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": model.model_json_schema()}
+            }
+        }
+    }
+
+
+def _bad_request(detail: str) -> ORJSONResponse:
+    """400 response for rejected input, returned without raising."""
+    return ORJSONResponse(status_code=400, content={"detail": detail})
+
+
+def _sse(data: str, event: str = None) -> str:
+    """Format one Server-Sent Events message."""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
+
+async def _parse_body(http_request: Request, adapter: TypeAdapter):
+    """Validate the raw request body, reporting errors like FastAPI does."""
+    try:
+        return adapter.validate_json(await http_request.body())
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+
+
+@router.post(
+    "/video/process",
+    response_model=VideoProcessResponse,
+    openapi_extra=_json_body(VideoProcessRequest)
+)
+async def process_video(http_request: Request):
     """
     Process a YouTube video: download, transcribe, and create RAG index.
     
     This endpoint may take several minutes depending on video length.
     """
+    request = await _parse_body(http_request, _VIDEO_PROCESS_ADAPTER)
     if not request.video_url:
-        raise HTTPException(status_code=400, detail="Video URL is required")
+        return _bad_request("Video URL is required")
     
-    result = video_service.process_video(request.video_url)
+    result = await video_service.process_video_async(request.video_url)
     
     if not result["success"]:
         raise HTTPException(status_code=500, detail=result.get("error", "Unknown error"))
     
-    return VideoProcessResponse(
+    return VideoProcessResponse.model_construct(
         success=True,
         message="Video processed successfully",
         video_title=result.get("video_title"),
@@ -48,54 +96,95 @@ async def process_video(request: VideoProcessRequest):
     )
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+@router.post(
+    "/chat",
+    response_model=ChatResponse,
+    openapi_extra=_json_body(ChatRequest)
+)
+async def chat(http_request: Request):
     """
     Ask a question about the processed video.
     
     Returns an AI-generated answer based on the video content.
     """
+    request = await _parse_body(http_request, _CHAT_ADAPTER)
     if not request.question.strip():
-        raise HTTPException(status_code=400, detail="Question cannot be empty")
+        return _bad_request("Question cannot be empty")
     
-    result = video_service.query(request.question)
+    result = await asyncio.to_thread(video_service.query, request.question)
     
     if not result["success"]:
-        return ChatResponse(
+        return ChatResponse.model_construct(
             answer="",
             success=False,
             error=result.get("error")
         )
     
-    return ChatResponse(
+    return ChatResponse.model_construct(
         answer=result["answer"],
         success=True
     )
 
 
-@router.post("/search", response_model=SearchResponse)
-async def search_chunks(request: SearchRequest):
+@router.post("/chat/stream", openapi_extra=_json_body(ChatRequest))
+async def chat_stream(http_request: Request):
+    """
+    Ask a question about the processed video, streaming the answer.
+    
+    Returns a text/event-stream of answer fragments, followed by a "done"
+    event (or an "error" event if generation fails).
+    """
+    request = await _parse_body(http_request, _CHAT_ADAPTER)
+    if not request.question.strip():
+        return _bad_request("Question cannot be empty")
+    
+    async def events():
+        try:
+            async for token in video_service.stream_query(request.question):
+                yield _sse(token)
+        except Exception as e:
+            yield _sse(str(e), event="error")
+            return
+        yield _sse("", event="done")
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.post(
+    "/search",
+    response_model=SearchResponse,
+    openapi_extra=_json_body(SearchRequest)
+)
+async def search_chunks(http_request: Request):
     """
     Search for relevant chunks in the transcription.
     
     Returns similar document chunks without generating an answer.
     """
+    request = await _parse_body(http_request, _SEARCH_ADAPTER)
     if not request.query.strip():
-        raise HTTPException(status_code=400, detail="Query cannot be empty")
+        return _bad_request("Query cannot be empty")
     
-    result = video_service.search_chunks(request.query, request.num_chunks)
+    result = await asyncio.to_thread(
+        video_service.search_chunks, request.query, request.num_chunks
+    )
     
     if not result["success"]:
-        return SearchResponse(
+        return SearchResponse.model_construct(
             chunks=[],
             success=False,
             error=result.get("error")
         )
     
-    return SearchResponse(
-        chunks=result["chunks"],
-        success=True
-    )
+    # Largest payload: the service already returns the response shape, so
+    # orjson serializes it in one pass without building ChunkData models.
+    # Nothing coerces the metadata here; VideoRAGService.search_chunks is
+    # responsible for returning JSON-safe values.
+    return ORJSONResponse(content={
+        "chunks": result["chunks"],
+        "success": True,
+        "error": None
+    })
 
 
 @router.get("/transcription", response_model=TranscriptionResponse)
@@ -106,16 +195,18 @@ async def get_transcription():
     result = video_service.get_transcription()
     
     if not result["success"]:
-        return TranscriptionResponse(
+        return TranscriptionResponse.model_construct(
             transcription="",
             success=False,
             error=result.get("error")
         )
     
-    return TranscriptionResponse(
+    # Large payload: serialize directly instead of re-validating it
+    payload = TranscriptionResponse.model_construct(
         transcription=result["transcription"],
         success=True
     )
+    return ORJSONResponse(content=payload.model_dump())
 
 
 @router.get("/status", response_model=StatusResponse)
@@ -124,4 +215,4 @@ async def get_status():
     Get the current status of the RAG system.
     """
     status = video_service.get_status()
-    return StatusResponse(**status)
\ No newline at end of file
+    return StatusResponse.model_construct(**status)
\ No newline at end of file
@@ -9,31 +9,62 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ModelConfig:
     """LLM and embedding model configuration."""
     llm_model: str = "gpt-3.5-turbo"
+    embedding_backend: str = "openai"  # or "local" (quantized ONNX model)
     embedding_model: str = "text-embedding-ada-002"
+    local_embedding_model: str = "BAAI/bge-small-en-v1.5"
+    embedding_batch_size: int = 128  # texts per embeddings request
+    embedding_concurrency: int = 4  # embeddings requests in flight
+    whisper_model: str = "base"  # or e.g. "distil-small.en" for English-only videos
+    whisper_device: str = "auto"  # "cuda" when a GPU is visible, else "cpu"
     temperature: float = 0.0
     max_tokens: int = 1000
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ChunkingConfig:
     """Document chunking configuration."""
     chunk_size: int = 1000
     chunk_overlap: int = 20
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VectorStoreConfig:
     """Vector store configuration."""
-    store_type: str = "pinecone"  # or "in_memory"
+    store_type: str = "pinecone"  # or "in_memory" / "hnsw"
     index_name: str = "es2al-index"
     top_k: int = 4
+    # HNSW graph parameters (store_type "hnsw")
+    hnsw_m: int = 32
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
 
+    def store_kwargs(self) -> dict:
+        """Extra arguments for the configured vector store type."""
+        if self.store_type == "hnsw":
+            return {
+                "m": self.hnsw_m,
+                "ef_construction": self.hnsw_ef_construction,
+                "ef_search": self.hnsw_ef_search
+            }
+        return {}
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
+class CacheConfig:
+    """Cache configuration."""
+    transcription_db: str = "transcription_cache.db"
+    transcription_ttl: int = 0  # seconds, 0 keeps entries forever
+    vector_cache_dir: str = "vector_cache"
+    qa_cache_path: str = "qa_cache.npz"
+    qa_cache_size: int = 1024
+    qa_similarity_threshold: float = 0.93
+
+
+@dataclass(slots=True, frozen=True)
 class Settings:
     """Main settings class."""
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
@@ -42,6 +73,7 @@ class Settings:
     model: ModelConfig = field(default_factory=ModelConfig)
     chunking: ChunkingConfig = field(default_factory=ChunkingConfig)
     vector_store: VectorStoreConfig = field(default_factory=VectorStoreConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
 
     def validate(self):
         """Validate required settings."""
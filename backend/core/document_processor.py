@@ -2,12 +2,123 @@
 Document processing module.
 Handles loading, splitting, and preprocessing of documents.
 """
-from typing import List
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import hashlib
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import List, Set
 from langchain_community.document_loaders import TextLoader
 from langchain_core.documents import Document
 
 
+SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+
+
+class FastRecursiveSplitter:
+    """
+    Recursive character splitter that packs pieces with a binary search.
+    
+    Splits on the highest-priority separator present in the text, then uses
+    prefix sums of the piece lengths to find the largest run of pieces that
+    fits in a chunk, instead of re-measuring candidate chunks piece by piece.
+    Pieces that are too long on their own are split with the next separators.
+    """
+    
+    def __init__(self, chunk_size: int, chunk_overlap: int, separators: List[str] = None):
+        """
+        Initialize the splitter.
+        
+        Args:
+            chunk_size: Maximum size of each chunk in characters
+            chunk_overlap: Maximum overlap between consecutive chunks
+            separators: Separators to split on, in priority order
+        """
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = separators or SEPARATORS
+    
+    def split_text(self, text: str) -> List[str]:
+        """Split a text into chunks."""
+        chunks = []
+        self._split(text, self.separators, chunks)
+        return chunks
+    
+    def split_documents(self, documents: List[Document]) -> List[Document]:
+        """Split documents into chunks, copying each source's metadata."""
+        return [
+            Document(page_content=chunk, metadata=dict(document.metadata))
+            for document in documents
+            for chunk in self.split_text(document.page_content)
+        ]
+    
+    def _split(self, text: str, separators: List[str], chunks: List[str]) -> None:
+        """Split text with the given separator cascade, appending to chunks."""
+        if len(text) <= self.chunk_size:
+            text = text.strip()
+            if text:
+                chunks.append(text)
+            return
+        
+        for index, separator in enumerate(separators):
+            if separator == "" or separator in text:
+                remaining = separators[index + 1:]
+                break
+        else:
+            separator, remaining = "", []
+        
+        if separator == "":
+            step = self.chunk_size - self.chunk_overlap
+            for start in range(0, len(text) - self.chunk_overlap, step):
+                chunk = text[start:start + self.chunk_size].strip()
+                if chunk:
+                    chunks.append(chunk)
+            return
+        
+        pieces = text.split(separator)
+        sep_len = len(separator)
+        
+        # offsets[k] - offsets[i] - sep_len == len(separator.join(pieces[i:k]))
+        offsets = [0]
+        for piece in pieces:
+            offsets.append(offsets[-1] + len(piece) + sep_len)
+        
+        count = len(pieces)
+        start = 0
+        while start < count:
+            end = bisect_right(offsets, offsets[start] + sep_len + self.chunk_size) - 1
+            if end <= start:
+                # A single piece is too long; split it with finer separators
+                self._split(pieces[start], remaining, chunks)
+                start += 1
+                continue
+            
+            chunk = separator.join(pieces[start:end]).strip()
+            if chunk:
+                chunks.append(chunk)
+            if end >= count:
+                break
+            
+            # Carry over the longest tail of pieces that fits in the overlap,
+            # as long as the next chunk can still grow past this one.
+            next_start = bisect_left(
+                offsets, offsets[end] - sep_len - self.chunk_overlap, start + 1, end
+            )
+            if offsets[end + 1] - offsets[next_start] - sep_len > self.chunk_size:
+                next_start = end
+            start = next_start
+
+
+@lru_cache(maxsize=8)
+def _get_splitter(chunk_size: int, chunk_overlap: int) -> FastRecursiveSplitter:
+    """Get a shared splitter for the given chunking parameters."""
+    return FastRecursiveSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=SEPARATORS
+    )
+
+
 class DocumentProcessor:
     """Handles document loading and chunking."""
     
@@ -19,10 +130,12 @@ class DocumentProcessor:
             chunk_size: Size of each text chunk
             chunk_overlap: Overlap between consecutive chunks
         """
-        self.splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
-        )
+        self.splitter = _get_splitter(chunk_size, chunk_overlap)
+        
+        # Chunks below the minimum are folded into a neighbour, allowing the
+        # merged chunk a little slack over the configured size.
+        self.min_chunk_size = int(chunk_size * 0.1)
+        self.max_merged_size = int(chunk_size * 1.05)
     
     def load_from_file(self, file_path: str) -> List[Document]:
         """
@@ -38,27 +151,118 @@ class DocumentProcessor:
         documents = loader.load()
         return self.split_documents(documents)
     
-    def load_from_text(self, text: str) -> List[Document]:
+    def load_from_text(self, text: str, dedupe: bool = True) -> List[Document]:
         """
         Load and chunk raw text.
         
         Args:
             text: Raw text string
+            dedupe: Drop chunks that repeat an earlier chunk
             
         Returns:
             List of document chunks
         """
         document = Document(page_content=text)
-        return self.split_documents([document])
+        return self.split_documents([document], dedupe=dedupe)
     
-    def split_documents(self, documents: List[Document]) -> List[Document]:
+    def split_documents(self, documents: List[Document], dedupe: bool = True) -> List[Document]:
         """
         Split documents into chunks.
         
         Args:
             documents: List of documents to split
+            dedupe: Drop chunks that repeat an earlier chunk
             
         Returns:
             List of document chunks
         """
-        return self.splitter.split_documents(documents)
\ No newline at end of file
+        chunks = self._merge_small_chunks(self.splitter.split_documents(documents))
+        return self.drop_duplicate_chunks(chunks) if dedupe else chunks
+    
+    def _merge_small_chunks(self, chunks: List[Document]) -> List[Document]:
+        """
+        Merge undersized chunks into the preceding chunk of the same source.
+        
+        The text a chunk repeats from the end of the preceding one as overlap
+        is dropped when they are merged, so it is not included twice.
+        
+        Args:
+            chunks: Chunks in document order
+            
+        Returns:
+            List of document chunks
+        """
+        merged: List[Document] = []
+        for chunk in chunks:
+            if merged:
+                previous = merged[-1]
+                is_small = (
+                    len(chunk.page_content) < self.min_chunk_size
+                    or len(previous.page_content) < self.min_chunk_size
+                )
+                overlap = self._shared_overlap(previous.page_content, chunk.page_content)
+                tail = chunk.page_content[overlap:].lstrip()
+                combined_size = len(previous.page_content) + 1 + len(tail)
+                if (
+                    is_small
+                    and combined_size <= self.max_merged_size
+                    and previous.metadata == chunk.metadata
+                ):
+                    if tail:
+                        previous.page_content = f"{previous.page_content} {tail}"
+                    continue
+            merged.append(chunk)
+        return merged
+    
+    def _shared_overlap(self, previous: str, chunk: str) -> int:
+        """
+        Find the overlap a chunk carries over from the end of the previous one.
+        
+        Args:
+            previous: Text of the preceding chunk
+            chunk: Text of the following chunk
+            
+        Returns:
+            Length of the longest prefix of chunk that ends previous, cut at
+            whitespace on both sides, or 0 if there is none
+        """
+        limit = min(self.splitter.chunk_overlap, len(previous), len(chunk))
+        for size in range(limit, 0, -1):
+            # The splitter only carries over whole pieces between separators
+            if size < len(chunk) and not chunk[size].isspace():
+                continue
+            if size < len(previous) and not previous[-size - 1].isspace():
+                continue
+            if previous.endswith(chunk[:size]):
+                return size
+        return 0
+    
+    def drop_duplicate_chunks(
+        self,
+        chunks: List[Document],
+        seen: Set[bytes] = None
+    ) -> List[Document]:
+        """
+        Drop chunks whose text repeats an earlier chunk.
+        
+        Text is compared ignoring case and whitespace differences, so
+        repeated intros, outros and boilerplate are embedded only once.
+        
+        Args:
+            chunks: Chunks in document order
+            seen: Digests of chunks already kept, updated in place; pass the
+                same set across calls to dedupe text that arrives in pieces
+            
+        Returns:
+            List of unique document chunks
+        """
+        if seen is None:
+            seen = set()
+        unique = []
+        for chunk in chunks:
+            normalized = " ".join(chunk.page_content.casefold().split())
+            digest = hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+            if digest not in seen:
+                seen.add(digest)
+                unique.append(chunk)
+        return unique
\ No newline at end of file
@@ -2,37 +2,100 @@
 Embeddings management module.
 Handles creation and management of text embeddings.
 """
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
 from typing import List
+import numpy as np
+from cachetools import TTLCache
+from langchain_core.embeddings import Embeddings
 from langchain_openai.embeddings import OpenAIEmbeddings
 
+from core import http_client
 
-class EmbeddingsManager:
+
+# Background event loop shared by all managers so the sync API can drive the
+# async client without creating (and tearing down) a loop per call.
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get the background event loop, starting it on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever,
+                name="embeddings-loop",
+                daemon=True
+            ).start()
+    return _loop
+
+
+def _run_sync(coro):
+    """Run a coroutine on the background loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+class EmbeddingsManager(Embeddings):
     """Manages text embeddings using OpenAI."""
     
-    def __init__(self, model: str = "text-embedding-ada-002", api_key: str = None):
+    def __init__(
+        self,
+        model: str = "text-embedding-ada-002",
+        api_key: str = None,
+        batch_size: int = 96,
+        max_concurrency: int = 8,
+        query_cache_size: int = 1024,
+        query_cache_ttl: int = 3600
+    ):
         """
         Initialize the embeddings manager.
         
         Args:
             model: OpenAI embedding model name
             api_key: OpenAI API key
+            batch_size: Number of texts sent per embeddings request
+            max_concurrency: Maximum number of requests in flight
+            query_cache_size: Maximum number of cached query embeddings
+            query_cache_ttl: Seconds a cached query embedding stays valid
         """
         self.embeddings = OpenAIEmbeddings(
             model=model,
-            openai_api_key=api_key
+            openai_api_key=api_key,
+            http_client=http_client.sync_client,
+            http_async_client=http_client.embeddings_async_client
         )
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self._query_cache = TTLCache(maxsize=query_cache_size, ttl=query_cache_ttl)
+        self._query_cache_lock = threading.Lock()
     
     def embed_query(self, query: str) -> List[float]:
         """
         Generate embedding for a single query.
         
+        Repeated queries (ignoring case and surrounding whitespace) are
+        served from a bounded TTL cache.
+        
         Args:
             query: Text query to embed
             
         Returns:
             Embedding vector
         """
-        return self.embeddings.embed_query(query)
+        key = query.strip().casefold()
+        with self._query_cache_lock:
+            vector = self._query_cache.get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(query)
+            with self._query_cache_lock:
+                self._query_cache[key] = vector
+        return vector
     
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """
@@ -44,8 +107,204 @@ class EmbeddingsManager:
         Returns:
             List of embedding vectors
         """
-        return self.embeddings.embed_documents(texts)
+        if not texts:
+            return []
+        return _run_sync(self.embed_documents_async(texts))
+    
+    async def embed_documents_async(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for multiple documents with concurrent batches.
+        
+        Args:
+            texts: List of texts to embed
+            
+        Returns:
+            List of embedding vectors, in input order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents(batch)
+        
+        results = await asyncio.gather(*(
+            embed_batch(texts[i:i + self.batch_size])
+            for i in range(0, len(texts), self.batch_size)
+        ))
+        return [vector for batch in results for vector in batch]
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Async embeddings entry point for LangChain integrations."""
+        return await self.embed_documents_async(texts)
     
     def get_embeddings_client(self):
         """Get the underlying embeddings client for vector store integration."""
-        return self.embeddings
\ No newline at end of file
+        return self.embeddings
+
+
+class LocalEmbeddingsManager(Embeddings):
+    """
+    Manages text embeddings with a local int8-quantized ONNX model.
+    
+    The model is exported from Hugging Face and quantized with
+    optimum-onnxruntime on first use, then cached on disk. Requires the
+    optional `optimum[onnxruntime]` package.
+    """
+    
+    # BGE models expect this prefix on retrieval queries (not on passages)
+    QUERY_INSTRUCTION = "Represent this sentence for searching relevant passages: "
+    
+    def __init__(
+        self,
+        model: str = "BAAI/bge-small-en-v1.5",
+        batch_size: int = 32,
+        max_length: int = 512,
+        cache_dir: str = "onnx_models",
+        query_cache_size: int = 1024,
+        query_cache_ttl: int = 3600
+    ):
+        """
+        Initialize the local embeddings manager.
+        
+        Args:
+            model: Hugging Face model ID of a BGE-style embedding model
+            batch_size: Number of texts run through the model at once
+            max_length: Maximum tokens per text (longer texts are truncated)
+            cache_dir: Directory holding the quantized ONNX models
+            query_cache_size: Maximum number of cached query embeddings
+            query_cache_ttl: Seconds a cached query embedding stays valid
+        """
+        self.model_name = model
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.model_dir = os.path.join(cache_dir, model.replace("/", "--") + "-int8")
+        self._model = None
+        self._tokenizer = None
+        self._load_lock = threading.Lock()
+        self._query_cache = TTLCache(maxsize=query_cache_size, ttl=query_cache_ttl)
+        self._query_cache_lock = threading.Lock()
+    
+    def _load(self):
+        """Load the quantized model, exporting and quantizing it on first use."""
+        with self._load_lock:
+            if self._model is not None:
+                return
+            try:
+                from optimum.onnxruntime import ORTModelForFeatureExtraction
+                from transformers import AutoTokenizer
+            except ImportError as e:
+                raise ImportError(
+                    "Local embeddings require optimum[onnxruntime]: "
+                    "pip install 'optimum[onnxruntime]'"
+                ) from e
+            
+            # The directory is renamed into place only once complete, so its
+            # model file marks a finished export
+            if not os.path.isfile(os.path.join(self.model_dir, "model_quantized.onnx")):
+                self._export()
+            
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+            self._model = ORTModelForFeatureExtraction.from_pretrained(
+                self.model_dir,
+                file_name="model_quantized.onnx",
+                provider="CPUExecutionProvider"
+            )
+    
+    def _export(self):
+        """Export and quantize the model into a temporary directory, then move it into place."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+        
+        marker = os.path.join(self.model_dir, "model_quantized.onnx")
+        parent = os.path.dirname(self.model_dir) or "."
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".export-")
+        try:
+            exported = ORTModelForFeatureExtraction.from_pretrained(
+                self.model_name,
+                export=True,
+                provider="CPUExecutionProvider"
+            )
+            # Dynamic int8 quantization targeting AVX-512 VNNI
+            ORTQuantizer.from_pretrained(exported).quantize(
+                save_dir=tmp_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(
+                    is_static=False,
+                    per_channel=False
+                )
+            )
+            AutoTokenizer.from_pretrained(self.model_name).save_pretrained(tmp_dir)
+            
+            if not os.path.isfile(marker):
+                # Clear out a partial export left by an older version
+                shutil.rmtree(self.model_dir, ignore_errors=True)
+            try:
+                os.replace(tmp_dir, self.model_dir)
+            except OSError:
+                # Another process finished the same export first
+                if not os.path.isfile(marker):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in batches, using the normalized CLS vector."""
+        self._load()
+        vectors = []
+        for i in range(0, len(texts), self.batch_size):
+            inputs = self._tokenizer(
+                texts[i:i + self.batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="np"
+            )
+            hidden = self._model(**inputs).last_hidden_state[:, 0]
+            hidden = hidden / np.linalg.norm(hidden, axis=1, keepdims=True)
+            vectors.extend(hidden.tolist())
+        return vectors
+    
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Generate embedding for a single query.
+        
+        Repeated queries (ignoring case and surrounding whitespace) are
+        served from a bounded TTL cache.
+        
+        Args:
+            query: Text query to embed
+            
+        Returns:
+            Embedding vector
+        """
+        key = query.strip().casefold()
+        with self._query_cache_lock:
+            vector = self._query_cache.get(key)
+        if vector is None:
+            vector = self._embed([self.QUERY_INSTRUCTION + query])[0]
+            with self._query_cache_lock:
+                self._query_cache[key] = vector
+        return vector
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for multiple documents.
+        
+        Args:
+            texts: List of texts to embed
+            
+        Returns:
+            List of embedding vectors
+        """
+        if not texts:
+            return []
+        return self._embed(texts)
+    
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Async embeddings entry point for LangChain integrations."""
+        return await asyncio.to_thread(self.embed_documents, texts)
+    
+    async def aembed_query(self, text: str) -> List[float]:
+        """Async query embedding entry point for LangChain integrations."""
+        return await asyncio.to_thread(self.embed_query, text)
\ No newline at end of file
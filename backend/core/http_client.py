@@ -0,0 +1,20 @@
+"""
+HTTP client module.
+Provides pooled HTTP clients shared by the OpenAI integrations.
+"""
+import httpx
+
+
+# Keep-alive pool sized for concurrent embedding batches plus chat traffic.
+# The timeout mirrors the OpenAI SDK default.
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=50, max_connections=100)
+HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+
+# Shared by every sync OpenAI call, so connections and TLS sessions are reused
+sync_client = httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+# Async pools are bound to the event loop that opened their connections, so
+# the API's event loop (LLM streaming) and the embeddings background loop
+# each get their own client.
+llm_async_client = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+embeddings_async_client = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
\ No newline at end of file
@@ -2,9 +2,40 @@
 LLM client module.
 Handles interaction with language models.
 """
+from typing import AsyncIterator, List
 from langchain_openai.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.messages import BaseMessage, HumanMessage
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableLambda
+
+from core import http_client
+
+
+def _compile_qa_prompt(template: str) -> RunnableLambda:
+    """
+    Compile a template with one {context} and one {question} placeholder.
+    
+    The template is split around its placeholders once, so formatting is
+    plain string concatenation instead of a pass through LangChain's
+    template engine. Produces the same messages as
+    ChatPromptTemplate.from_template(template).
+    
+    Args:
+        template: Prompt template string
+        
+    Returns:
+        Runnable mapping prompt variables to chat messages
+    """
+    head, _, rest = template.partition("{context}")
+    middle, _, tail = rest.partition("{question}")
+    
+    def format_prompt(prompt_vars: dict) -> List[BaseMessage]:
+        return [HumanMessage(
+            content=f"{head}{prompt_vars['context']}{middle}{prompt_vars['question']}{tail}"
+        )]
+    
+    return RunnableLambda(format_prompt)
 
 
 class LLMClient:
@@ -39,10 +70,13 @@ Question: {question}
             openai_api_key=api_key,
             model=model,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            http_client=http_client.sync_client,
+            http_async_client=http_client.llm_async_client
         )
         self.parser = StrOutputParser()
         self.prompt = None
+        self._chain = None
     
     def set_prompt_template(self, template: str = None) -> None:
         """
@@ -52,7 +86,11 @@ Question: {question}
             template: Prompt template string (uses default if None)
         """
         template = template or self.DEFAULT_PROMPT_TEMPLATE
-        self.prompt = ChatPromptTemplate.from_template(template)
+        if template == self.DEFAULT_PROMPT_TEMPLATE:
+            self.prompt = _compile_qa_prompt(template)
+        else:
+            self.prompt = ChatPromptTemplate.from_template(template)
+        self._chain = self.prompt | self.model | self.parser
     
     def generate(self, prompt_vars: dict) -> str:
         """
@@ -64,11 +102,26 @@ Question: {question}
         Returns:
             Generated response string
         """
-        if self.prompt is None:
+        if self._chain is None:
+            self.set_prompt_template()
+        
+        return self._chain.invoke(prompt_vars)
+    
+    async def stream(self, prompt_vars: dict) -> AsyncIterator[str]:
+        """
+        Stream a response from the LLM as it is generated.
+        
+        Args:
+            prompt_vars: Variables to fill the prompt template
+            
+        Yields:
+            Response text fragments
+        """
+        if self._chain is None:
             self.set_prompt_template()
         
-        chain = self.prompt | self.model | self.parser
-        return chain.invoke(prompt_vars)
+        async for token in self._chain.astream(prompt_vars):
+            yield token
     
     def get_model(self):
         """Get the underlying model for chain integration."""
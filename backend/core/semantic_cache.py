@@ -0,0 +1,198 @@
+"""
+Semantic cache module.
+Caches answers by question, matching exact repeats and close paraphrases.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+import numpy as np
+
+
+class SemanticCache:
+    """
+    LRU cache of question embeddings and their answers.
+    
+    Lookups try an exact (normalized) question match first, then fall back
+    to cosine similarity against every cached question embedding.
+    """
+    
+    def __init__(self, max_entries: int = 1024, threshold: float = 0.93):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of cached answers
+            threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.scope: Optional[str] = None
+        self._lock = threading.Lock()
+        self._reset()
+    
+    def _reset(self):
+        """Drop all entries."""
+        # Question key -> row in the vector/answer arrays, in LRU order
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._vectors: Optional[np.ndarray] = None
+        self._keys: List[Optional[str]] = [None] * self.max_entries
+        self._answers: List[Optional[str]] = [None] * self.max_entries
+    
+    @staticmethod
+    def _key(question: str) -> str:
+        """Normalize a question for exact matching."""
+        return " ".join(question.split()).casefold()
+    
+    def __len__(self) -> int:
+        """Number of cached answers."""
+        return len(self._slots)
+    
+    def get_exact(self, question: str) -> Optional[str]:
+        """
+        Look up an answer for the same question.
+        
+        Args:
+            question: User question
+            
+        Returns:
+            Cached answer, or None on a miss
+        """
+        key = self._key(question)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                return None
+            self._slots.move_to_end(key)
+            return self._answers[slot]
+    
+    def get_similar(self, embedding: List[float]) -> Optional[str]:
+        """
+        Look up an answer for the most similar cached question.
+        
+        Args:
+            embedding: Question embedding
+            
+        Returns:
+            Cached answer if the best match clears the threshold, else None
+        """
+        query = self._normalize(embedding)
+        with self._lock:
+            # Vectors from a different embedding model can never match
+            if not self._slots or self._vectors.shape[1] != len(query):
+                return None
+            scores = self._vectors @ query
+            # Rows past the last used slot are zeros and never win
+            slot = int(np.argmax(scores))
+            if scores[slot] < self.threshold:
+                return None
+            self._slots.move_to_end(self._keys[slot])
+            return self._answers[slot]
+    
+    def put(self, question: str, embedding: List[float], answer: str, scope: Optional[str]):
+        """
+        Cache an answer, evicting the least recently used entry when full.
+        
+        Args:
+            question: User question
+            embedding: Question embedding
+            answer: Generated answer
+            scope: Cache scope when the answer was requested; the answer is
+                dropped if the cache has been cleared for other content since
+        """
+        key = self._key(question)
+        vector = self._normalize(embedding)
+        with self._lock:
+            if scope != self.scope:
+                return
+            if self._vectors is not None and self._vectors.shape[1] != len(vector):
+                # The embedding model changed; entries of the old size are unusable
+                self._reset()
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+            slot = self._slots.pop(key, None)
+            if slot is None:
+                if len(self._slots) < self.max_entries:
+                    slot = len(self._slots)
+                else:
+                    _, slot = self._slots.popitem(last=False)
+            self._slots[key] = slot
+            self._keys[slot] = key
+            self._vectors[slot] = vector
+            self._answers[slot] = answer
+    
+    def clear(self, scope: Optional[str] = None):
+        """
+        Drop all entries.
+        
+        Args:
+            scope: Identifier of the content the new entries will answer for
+        """
+        with self._lock:
+            self._reset()
+            self.scope = scope
+    
+    def save(self, path: str):
+        """
+        Save the cache to an .npz file.
+        
+        Args:
+            path: Destination file path
+        """
+        with self._lock:
+            if not self._slots:
+                return
+            keys = list(self._slots)
+            slots = [self._slots[k] for k in keys]
+            # Write then rename, so a crash never leaves a partial file behind
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    keys=np.array(keys),
+                    vectors=self._vectors[slots],
+                    answers=np.array([self._answers[s] for s in slots]),
+                    scope=np.array(self.scope or "")
+                )
+            os.replace(tmp_path, path)
+    
+    def load(self, path: str):
+        """
+        Load a cache saved with save(), if the file exists.
+        
+        An unreadable file leaves the cache empty.
+        
+        Args:
+            path: Source file path
+        """
+        if not os.path.exists(path):
+            return
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                keys = data["keys"].tolist()
+                vectors = data["vectors"]
+                answers = data["answers"].tolist()
+                scope = str(data["scope"]) or None
+        except Exception:
+            # Losing cached answers is cheaper than failing to start
+            return
+        
+        # Keep the most recently used entries if the cap shrank
+        keep = slice(-self.max_entries, None)
+        keys, vectors, answers = keys[keep], vectors[keep], answers[keep]
+        with self._lock:
+            self._reset()
+            self.scope = scope
+            self._vectors = np.zeros((self.max_entries, vectors.shape[1]), dtype=np.float32)
+            self._vectors[:len(keys)] = vectors
+            for slot, (key, answer) in enumerate(zip(keys, answers)):
+                self._slots[key] = slot
+                self._keys[slot] = key
+                self._answers[slot] = answer
+    
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        """Convert an embedding to a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
\ No newline at end of file
@@ -2,9 +2,16 @@
 Vector store module.
 Handles document storage and similarity search.
 """
-from typing import List, Protocol
+import json
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Protocol
+import hnswlib
+import numpy as np
 from langchain.schema import Document
-from langchain_community.vectorstores import DocArrayInMemorySearch
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.retrievers import BaseRetriever
 from langchain_pinecone import PineconeVectorStore
 
 
@@ -15,6 +22,14 @@ class VectorStoreProtocol(Protocol):
         """Add documents to the vector store."""
         ...
     
+    def add_documents_with_embeddings(
+        self,
+        documents: List[Document],
+        embeddings: List[List[float]]
+    ) -> None:
+        """Add documents whose embeddings are already computed."""
+        ...
+    
     def similarity_search(self, query: str, k: int = 4) -> List[Document]:
         """Search for similar documents."""
         ...
@@ -22,6 +37,146 @@ class VectorStoreProtocol(Protocol):
     def as_retriever(self, **kwargs):
         """Get a retriever interface."""
         ...
+    
+    def save(self, path: str) -> None:
+        """Persist the stored documents to a directory."""
+        ...
+    
+    def load(self, path: str) -> int:
+        """Load documents saved with save(), returning how many were loaded."""
+        ...
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize vectors along the last axis."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+
+@dataclass
+class ChunkStore:
+    """
+    Struct-of-arrays storage for chunks.
+    
+    Embeddings live in one preallocated matrix that grows geometrically;
+    contents and metadata are parallel lists indexed by row. When quantized,
+    the matrix holds int8 rows with a float32 scale per row, a quarter of
+    the memory traffic of float32 for the same ranking.
+    """
+    mat: np.ndarray
+    contents: List[str] = field(default_factory=list)
+    metadatas: List[dict] = field(default_factory=list)
+    scales: Optional[np.ndarray] = None
+    
+    # Rows dequantized per step while scoring; small enough to stay in cache
+    SCORE_BLOCK = 256
+    
+    @classmethod
+    def empty(cls, dim: int, capacity: int = 256, quantize: bool = False) -> "ChunkStore":
+        """Create an empty store with room for `capacity` vectors."""
+        if quantize:
+            return cls(
+                mat=np.empty((capacity, dim), dtype=np.int8),
+                scales=np.empty(capacity, dtype=np.float32)
+            )
+        return cls(mat=np.empty((capacity, dim), dtype=np.float32))
+    
+    def __len__(self) -> int:
+        return len(self.contents)
+    
+    @property
+    def vectors(self) -> np.ndarray:
+        """View of the filled rows of the embedding matrix."""
+        return self.mat[:len(self)]
+    
+    def append(self, vectors: np.ndarray, contents: List[str], metadatas: List[dict]) -> None:
+        """Append rows, doubling the matrix capacity when it is full."""
+        size = len(self)
+        needed = size + len(vectors)
+        if needed > self.mat.shape[0]:
+            capacity = max(needed, 2 * self.mat.shape[0])
+            grown = np.empty((capacity, self.mat.shape[1]), dtype=self.mat.dtype)
+            grown[:size] = self.mat[:size]
+            self.mat = grown
+            if self.scales is not None:
+                grown_scales = np.empty(capacity, dtype=np.float32)
+                grown_scales[:size] = self.scales[:size]
+                self.scales = grown_scales
+        
+        if self.scales is None:
+            self.mat[size:needed] = vectors
+        else:
+            # Symmetric per-row quantization: row ~= mat_i8 * scale
+            scales = np.maximum(np.abs(vectors).max(axis=1), np.finfo(np.float32).tiny) / 127
+            self.mat[size:needed] = np.round(vectors / scales[:, None]).astype(np.int8)
+            self.scales[size:needed] = scales
+        self.contents.extend(contents)
+        self.metadatas.extend(metadatas)
+    
+    def scores(self, query_vector: np.ndarray) -> np.ndarray:
+        """Dot products of every stored row with a float32 query vector."""
+        if self.scales is None:
+            return self.vectors @ query_vector
+        
+        size = len(self)
+        scores = np.empty(size, dtype=np.float32)
+        for start in range(0, size, self.SCORE_BLOCK):
+            end = min(start + self.SCORE_BLOCK, size)
+            scores[start:end] = self.mat[start:end].astype(np.float32) @ query_vector
+        return scores * self.scales[:size]
+    
+    def dense_vectors(self, start: int, end: int) -> np.ndarray:
+        """Float32 copy of a range of stored rows."""
+        if self.scales is None:
+            return np.array(self.mat[start:end], dtype=np.float32)
+        return self.mat[start:end].astype(np.float32) * self.scales[start:end, None]
+    
+    def document(self, index: int) -> Document:
+        """Build the Document stored at a row."""
+        return Document(page_content=self.contents[index], metadata=self.metadatas[index])
+    
+    def save(self, path: str) -> None:
+        """Write the filled rows to an .npz file."""
+        size = len(self)
+        arrays = {
+            "mat": self.mat[:size],
+            "contents": np.array(self.contents, dtype=str),
+            "metadatas": np.array(json.dumps(self.metadatas))
+        }
+        if self.scales is not None:
+            arrays["scales"] = self.scales[:size]
+        # Write then rename, so a crash never leaves a partial file behind
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> "ChunkStore":
+        """Read a store written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                mat=data["mat"],
+                contents=data["contents"].tolist(),
+                metadatas=json.loads(str(data["metadatas"])),
+                scales=data["scales"] if "scales" in data else None
+            )
+
+
+class StoreRetriever(BaseRetriever):
+    """Retriever that delegates to a vector store's similarity search."""
+    
+    store: Any
+    k: int = 4
+    
+    def _get_relevant_documents(
+        self,
+        query: str,
+        *,
+        run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        """Get the top-k documents for a query."""
+        return self.store.similarity_search(query, k=self.k)
 
 
 class VectorStoreFactory:
@@ -38,7 +193,7 @@ class VectorStoreFactory:
         Create a vector store instance.
         
         Args:
-            store_type: Type of vector store ("in_memory" or "pinecone")
+            store_type: Type of vector store ("in_memory", "hnsw" or "pinecone")
             embeddings: Embeddings client
             index_name: Index name (required for Pinecone)
             **kwargs: Additional arguments
@@ -47,7 +202,9 @@ class VectorStoreFactory:
             Vector store instance
         """
         if store_type == "in_memory":
-            return InMemoryVectorStore(embeddings)
+            return InMemoryVectorStore(embeddings, **kwargs)
+        elif store_type == "hnsw":
+            return HNSWVectorStore(embeddings, **kwargs)
         elif store_type == "pinecone":
             if not index_name:
                 raise ValueError("index_name required for Pinecone vector store")
@@ -57,44 +214,234 @@ class VectorStoreFactory:
 
 
 class InMemoryVectorStore:
-    """In-memory vector store wrapper."""
+    """
+    In-memory vector store backed by a NumPy matrix.
+    
+    Embeddings are kept L2-normalized in a contiguous matrix, so a cosine
+    similarity search is a single pass of matrix-vector products.
+    """
+    
+    # File name used by save() and load()
+    CHUNKS_FILE = "chunks.npz"
     
-    def __init__(self, embeddings):
+    def __init__(self, embeddings, quantize: bool = True):
         """
         Initialize in-memory vector store.
         
         Args:
             embeddings: Embeddings client
+            quantize: Store embeddings as int8 instead of float32
         """
         self.embeddings = embeddings
-        self.store = None
+        self.quantize = quantize
+        self._chunks: Optional[ChunkStore] = None
     
     def add_documents(self, documents: List[Document]) -> None:
         """Add documents to the vector store."""
-        if self.store is None:
-            self.store = DocArrayInMemorySearch.from_documents(
-                documents, 
-                self.embeddings
+        if not documents:
+            return
+        embeddings = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        self.add_documents_with_embeddings(documents, embeddings)
+    
+    def add_documents_with_embeddings(
+        self,
+        documents: List[Document],
+        embeddings: List[List[float]]
+    ) -> None:
+        """Add documents whose embeddings are already computed."""
+        if not documents:
+            return
+        vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+        if self._chunks is None:
+            self._chunks = ChunkStore.empty(
+                vectors.shape[1],
+                capacity=max(256, len(vectors)),
+                quantize=self.quantize
             )
-        else:
-            self.store.add_documents(documents)
+        self._chunks.append(
+            vectors,
+            [doc.page_content for doc in documents],
+            [doc.metadata for doc in documents]
+        )
     
     def similarity_search(self, query: str, k: int = 4) -> List[Document]:
         """Search for similar documents."""
-        if self.store is None:
+        if self._chunks is None:
             return []
-        return self.store.similarity_search(query, k=k)
+        query_vector = self._embed_query(query)
+        scores = self._chunks.scores(query_vector)
+        
+        k = min(k, len(self._chunks))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self._chunks.document(i) for i in top]
     
     def as_retriever(self, **kwargs):
         """Get a retriever interface."""
-        if self.store is None:
+        if self._chunks is None:
             raise ValueError("Vector store is empty. Add documents first.")
-        return self.store.as_retriever(**kwargs)
+        search_kwargs = kwargs.get("search_kwargs", {})
+        return StoreRetriever(store=self, k=search_kwargs.get("k", 4))
+    
+    def save(self, path: str) -> None:
+        """
+        Persist the stored documents and embeddings.
+        
+        Args:
+            path: Directory to save into (created if missing)
+        """
+        if self._chunks is None:
+            return
+        os.makedirs(path, exist_ok=True)
+        self._chunks.save(os.path.join(path, self.CHUNKS_FILE))
+    
+    def load(self, path: str) -> int:
+        """
+        Replace the store contents with documents saved by save().
+        
+        Args:
+            path: Directory saved into
+            
+        Returns:
+            Number of documents loaded (0 if nothing was saved there)
+        """
+        chunks_path = os.path.join(path, self.CHUNKS_FILE)
+        if not os.path.exists(chunks_path):
+            return 0
+        self._chunks = ChunkStore.load(chunks_path)
+        return len(self._chunks)
+    
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embed and normalize a query."""
+        return _normalize(np.asarray(self.embeddings.embed_query(query), dtype=np.float32))
+
+
+class HNSWVectorStore(InMemoryVectorStore):
+    """
+    In-memory vector store with an HNSW approximate nearest-neighbor index.
+    
+    Flat search is exact and fast for small collections, so the graph is
+    only built once the store reaches `min_index_size` chunks; after that
+    new chunks are added to it incrementally.
+    """
+    
+    INDEX_FILE = "hnsw.bin"
+    
+    def __init__(
+        self,
+        embeddings,
+        quantize: bool = True,
+        min_index_size: int = 10000,
+        m: int = 32,
+        ef_construction: int = 200,
+        ef_search: int = 64
+    ):
+        """
+        Initialize HNSW vector store.
+        
+        Args:
+            embeddings: Embeddings client
+            quantize: Store embeddings as int8 instead of float32
+            min_index_size: Number of chunks at which the HNSW index is built
+            m: Graph connectivity (links per node)
+            ef_construction: Candidate list size while building the graph
+            ef_search: Candidate list size while searching
+        """
+        super().__init__(embeddings, quantize=quantize)
+        self.min_index_size = min_index_size
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._index = None
+    
+    def add_documents_with_embeddings(
+        self,
+        documents: List[Document],
+        embeddings: List[List[float]]
+    ) -> None:
+        """Add documents whose embeddings are already computed."""
+        start = len(self._chunks) if self._chunks is not None else 0
+        super().add_documents_with_embeddings(documents, embeddings)
+        if self._chunks is not None:
+            self._update_index(start)
+    
+    def _update_index(self, start: int) -> None:
+        """Index rows from `start` on, building the graph once the store is large enough."""
+        if self._index is None:
+            if len(self._chunks) < self.min_index_size:
+                return
+            self._index = hnswlib.Index(space="ip", dim=self._chunks.mat.shape[1])
+            self._index.init_index(
+                max_elements=self._chunks.mat.shape[0],
+                ef_construction=self.ef_construction,
+                M=self.m
+            )
+            start = 0
+        
+        end = len(self._chunks)
+        if end > self._index.get_max_elements():
+            self._index.resize_index(self._chunks.mat.shape[0])
+        self._index.add_items(self._chunks.dense_vectors(start, end), np.arange(start, end))
+    
+    def similarity_search(self, query: str, k: int = 4) -> List[Document]:
+        """Search for similar documents."""
+        if self._index is None:
+            return super().similarity_search(query, k=k)
+        
+        k = min(k, len(self._chunks))
+        self._index.set_ef(max(self.ef_search, k))
+        labels, _ = self._index.knn_query(self._embed_query(query), k=k)
+        return [self._chunks.document(int(i)) for i in labels[0]]
+    
+    def save(self, path: str) -> None:
+        """
+        Persist the stored documents, embeddings and HNSW graph.
+        
+        Args:
+            path: Directory to save into (created if missing)
+        """
+        if self._chunks is None:
+            return
+        os.makedirs(path, exist_ok=True)
+        # The graph goes first: load() only looks for it once the chunks exist
+        index_path = os.path.join(path, self.INDEX_FILE)
+        if self._index is not None:
+            self._index.save_index(index_path)
+        elif os.path.exists(index_path):
+            os.remove(index_path)
+        super().save(path)
+    
+    def load(self, path: str) -> int:
+        """
+        Replace the store contents with documents saved by save().
+        
+        Args:
+            path: Directory saved into
+            
+        Returns:
+            Number of documents loaded (0 if nothing was saved there)
+        """
+        self._index = None
+        count = super().load(path)
+        if not count:
+            return 0
+        
+        index_path = os.path.join(path, self.INDEX_FILE)
+        if os.path.exists(index_path):
+            self._index = hnswlib.Index(space="ip", dim=self._chunks.mat.shape[1])
+            self._index.load_index(index_path, max_elements=self._chunks.mat.shape[0])
+        else:
+            self._update_index(0)
+        return count
 
 
 class PineconeVectorStoreWrapper:
     """Pinecone vector store wrapper."""
     
+    # Vectors per upsert request, and upsert requests in flight
+    UPSERT_BATCH_SIZE = 100
+    UPSERT_POOL_THREADS = 8
+    
     def __init__(self, embeddings, index_name: str):
         """
         Initialize Pinecone vector store.
@@ -106,17 +453,46 @@ class PineconeVectorStoreWrapper:
         self.embeddings = embeddings
         self.index_name = index_name
         self.store = None
+        self._index = None
+    
+    def _get_index(self):
+        """Connect to the Pinecone index on first use."""
+        if self._index is None:
+            self._index = PineconeVectorStore.get_pinecone_index(
+                self.index_name,
+                pool_threads=self.UPSERT_POOL_THREADS
+            )
+            self.store = PineconeVectorStore(index=self._index, embedding=self.embeddings)
+        return self._index
     
     def add_documents(self, documents: List[Document]) -> None:
         """Add documents to the vector store."""
-        if self.store is None:
-            self.store = PineconeVectorStore.from_documents(
-                documents,
-                self.embeddings,
-                index_name=self.index_name
-            )
-        else:
-            self.store.add_documents(documents)
+        if not documents:
+            return
+        embeddings = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        self.add_documents_with_embeddings(documents, embeddings)
+    
+    def add_documents_with_embeddings(
+        self,
+        documents: List[Document],
+        embeddings: List[List[float]]
+    ) -> None:
+        """Add documents whose embeddings are already computed."""
+        if not documents:
+            return
+        index = self._get_index()
+        records = [
+            (str(uuid.uuid4()), vector, {**doc.metadata, "text": doc.page_content})
+            for doc, vector in zip(documents, embeddings)
+        ]
+        
+        # Issue every upsert batch before waiting on any of them
+        pending = [
+            index.upsert(vectors=records[i:i + self.UPSERT_BATCH_SIZE], async_req=True)
+            for i in range(0, len(records), self.UPSERT_BATCH_SIZE)
+        ]
+        for result in pending:
+            result.get()
     
     def similarity_search(self, query: str, k: int = 4) -> List[Document]:
         """Search for similar documents."""
@@ -124,6 +500,18 @@ class PineconeVectorStoreWrapper:
             return []
         return self.store.similarity_search(query, k=k)
     
+    def save(self, path: str) -> None:
+        """No-op: Pinecone already persists the index remotely."""
+    
+    def load(self, path: str) -> int:
+        """
+        No-op: the index is shared, so there is no per-video state to load.
+        
+        Returns:
+            Always 0, so callers ingest as usual
+        """
+        return 0
+    
     def as_retriever(self, **kwargs):
         """Get a retriever interface."""
         if self.store is None:
@@ -4,7 +4,7 @@ Demonstrates usage of the production RAG pipeline.
 """
 from config.settings import settings
 from core.document_processor import DocumentProcessor
-from core.embeddings_manager import EmbeddingsManager
+from core.embeddings_manager import EmbeddingsManager, LocalEmbeddingsManager
 from core.llm_client import LLMClient
 from pipeline.rag_pipeline import RAGPipeline
 
@@ -25,10 +25,15 @@ def create_rag_pipeline() -> RAGPipeline:
         chunk_overlap=settings.chunking.chunk_overlap
     )
     
-    embeddings_manager = EmbeddingsManager(
-        model=settings.model.embedding_model,
-        api_key=settings.openai_api_key
-    )
+    if settings.model.embedding_backend == "local":
+        embeddings_manager = LocalEmbeddingsManager(model=settings.model.local_embedding_model)
+    else:
+        embeddings_manager = EmbeddingsManager(
+            model=settings.model.embedding_model,
+            api_key=settings.openai_api_key,
+            batch_size=settings.model.embedding_batch_size,
+            max_concurrency=settings.model.embedding_concurrency
+        )
     
     llm_client = LLMClient(
         model=settings.model.llm_model,
@@ -44,7 +49,8 @@ def create_rag_pipeline() -> RAGPipeline:
         vector_store_type=settings.vector_store.store_type,
         llm_client=llm_client,
         index_name=settings.vector_store.index_name,
-        top_k=settings.vector_store.top_k
+        top_k=settings.vector_store.top_k,
+        vector_store_kwargs=settings.vector_store.store_kwargs()
     )
     
     return pipeline
@@ -2,7 +2,9 @@
 RAG pipeline orchestration module.
 Coordinates the entire RAG workflow.
 """
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, List
 from langchain.schema import Document
 from langchain_core.runnables import RunnableParallel, RunnablePassthrough
 
@@ -15,6 +17,9 @@ from core.llm_client import LLMClient
 class RAGPipeline:
     """Orchestrates the RAG workflow."""
     
+    # Streamed text is split and embedded in batches of about this many chunks
+    STREAM_BATCH_CHUNKS = 8
+    
     def __init__(
         self,
         document_processor: DocumentProcessor,
@@ -22,7 +27,8 @@ class RAGPipeline:
         vector_store_type: str,
         llm_client: LLMClient,
         index_name: str = None,
-        top_k: int = 4
+        top_k: int = 4,
+        vector_store_kwargs: dict = None
     ):
         """
         Initialize the RAG pipeline.
@@ -34,20 +40,26 @@ class RAGPipeline:
             llm_client: LLM client instance
             index_name: Vector store index name
             top_k: Number of documents to retrieve
+            vector_store_kwargs: Extra vector store arguments (e.g. HNSW parameters)
         """
         self.doc_processor = document_processor
         self.embeddings = embeddings_manager
         self.llm = llm_client
         self.top_k = top_k
         
-        # Initialize vector store
+        # Initialize vector store (embeds through the manager's batched path)
         self.vector_store = VectorStoreFactory.create(
             store_type=vector_store_type,
-            embeddings=embeddings_manager.get_embeddings_client(),
-            index_name=index_name
+            embeddings=embeddings_manager,
+            index_name=index_name,
+            **(vector_store_kwargs or {})
         )
         
+        # Built lazily on the first query after an ingest
         self.chain = None
+        self._retriever = None
+        self._has_documents = False
+        self._store_lock = threading.Lock()
     
     def ingest_documents(self, file_path: str = None, text: str = None) -> int:
         """
@@ -67,16 +79,112 @@ class RAGPipeline:
         else:
             raise ValueError("Either file_path or text must be provided")
         
-        self.vector_store.add_documents(chunks)
-        self._build_chain()
+        # Embed once up front; the store only indexes the vectors
+        embeddings = self.embeddings.embed_documents([chunk.page_content for chunk in chunks])
+        self.vector_store.add_documents_with_embeddings(chunks, embeddings)
+        
+        if chunks:
+            self._has_documents = True
+            self.chain = None
         
         return len(chunks)
     
+    def ingest_stream(self, texts: Iterable[str], max_workers: int = 4) -> int:
+        """
+        Ingest text while it is still being produced.
+        
+        Pieces are buffered until they make up about STREAM_BATCH_CHUNKS
+        chunks, which are then embedded and stored on a thread pool while
+        the next pieces arrive. The last, possibly incomplete, chunk is
+        carried over into the next batch, and duplicates are dropped across
+        the whole stream, so the chunks match a one-shot ingest.
+        
+        Args:
+            texts: Text pieces in order (e.g. transcript segments)
+            max_workers: Maximum number of batches embedded at once
+            
+        Returns:
+            Number of chunks processed
+        """
+        batch_size = self.doc_processor.splitter.chunk_size * self.STREAM_BATCH_CHUNKS
+        
+        def store(chunks: List[Document]) -> None:
+            embeddings = self.embeddings.embed_documents([chunk.page_content for chunk in chunks])
+            with self._store_lock:
+                self.vector_store.add_documents_with_embeddings(chunks, embeddings)
+        
+        num_chunks = 0
+        seen = set()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = []
+            buffer = ""
+            for text in texts:
+                buffer = f"{buffer} {text}" if buffer else text
+                if len(buffer) < batch_size:
+                    continue
+                chunks = self.doc_processor.load_from_text(buffer, dedupe=False)
+                buffer = chunks.pop().page_content if chunks else ""
+                chunks = self.doc_processor.drop_duplicate_chunks(chunks, seen)
+                if chunks:
+                    pending.append(executor.submit(store, chunks))
+                    num_chunks += len(chunks)
+            
+            chunks = self.doc_processor.load_from_text(buffer, dedupe=False) if buffer else []
+            chunks = self.doc_processor.drop_duplicate_chunks(chunks, seen)
+            if chunks:
+                pending.append(executor.submit(store, chunks))
+                num_chunks += len(chunks)
+            for future in pending:
+                future.result()
+        
+        if num_chunks:
+            self._has_documents = True
+            self.chain = None
+        
+        return num_chunks
+    
+    def save(self, path: str) -> None:
+        """
+        Persist the ingested documents so a later load() can skip ingestion.
+        
+        Args:
+            path: Directory to save into
+        """
+        self.vector_store.save(path)
+    
+    def load(self, path: str) -> int:
+        """
+        Load documents saved by save() in place of ingesting them.
+        
+        Args:
+            path: Directory saved into
+            
+        Returns:
+            Number of chunks loaded (0 if nothing was saved there)
+        """
+        num_chunks = self.vector_store.load(path)
+        if num_chunks:
+            self._has_documents = True
+            self.chain = None
+        return num_chunks
+    
+    def _get_chain(self):
+        """Get the RAG chain, building it on first use."""
+        if self.chain is None:
+            if not self._has_documents:
+                raise ValueError("No documents ingested. Call ingest_documents first.")
+            self._build_chain()
+        return self.chain
+    
     def _build_chain(self) -> None:
         """Build the RAG chain."""
-        retriever = self.vector_store.as_retriever(
-            search_kwargs={"k": self.top_k}
-        )
+        # The retriever wraps the store itself, so it sees documents added
+        # later and is only created once.
+        if self._retriever is None:
+            self._retriever = self.vector_store.as_retriever(
+                search_kwargs={"k": self.top_k}
+            )
+        retriever = self._retriever
         
         def format_docs(docs):
             """Format retrieved documents into a single string."""
@@ -102,10 +210,20 @@ class RAGPipeline:
         Returns:
             Generated answer
         """
-        if self.chain is None:
-            raise ValueError("No documents ingested. Call ingest_documents first.")
+        return self._get_chain().invoke(question)
+    
+    async def stream_query(self, question: str) -> AsyncIterator[str]:
+        """
+        Query the RAG system, streaming the answer as it is generated.
         
-        return self.chain.invoke(question)
+        Args:
+            question: Question to answer
+            
+        Yields:
+            Answer text fragments
+        """
+        async for token in self._get_chain().astream(question):
+            yield token
     
     def search_similar(self, query: str, k: int = None) -> List[Document]:
         """
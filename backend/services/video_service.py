@@ -2,19 +2,77 @@
 Video processing service.
 Handles YouTube video download, transcription, and RAG pipeline management.
 """
+import asyncio
+import atexit
+import concurrent.futures
 import tempfile
 import os
-import whisper
+import re
+import shutil
+import sqlite3
+import subprocess
+import threading
+import time
+import ctranslate2
+import numpy as np
 import yt_dlp
-from typing import Optional, Dict, Any
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from typing import AsyncIterator, Iterator, Optional, Dict, Any, Tuple
 
 from config.settings import settings
 from core.document_processor import DocumentProcessor
-from core.embeddings_manager import EmbeddingsManager
+from core.embeddings_manager import EmbeddingsManager, LocalEmbeddingsManager
 from core.llm_client import LLMClient
+from core.semantic_cache import SemanticCache
 from pipeline.rag_pipeline import RAGPipeline
 
 
+# Whisper expects 16 kHz mono audio.
+SAMPLE_RATE = 16000
+
+# Matches the 11-character video ID in watch, youtu.be, embed and shorts URLs.
+_VIDEO_ID_RE = re.compile(
+    r"(?:[?&]v=|youtu\.be/|/embed/|/shorts/|/live/)([0-9A-Za-z_-]{11})(?![0-9A-Za-z_-])"
+)
+
+
+def _extract_video_id(video_url: str) -> Optional[str]:
+    """
+    Extract the YouTube video ID from a URL.
+    
+    Args:
+        video_url: YouTube video URL
+        
+    Returns:
+        Video ID, or None if the URL does not contain one
+    """
+    match = _VIDEO_ID_RE.search(video_url)
+    return match.group(1) if match else None
+
+
+def _load_audio(path: str) -> np.ndarray:
+    """
+    Decode an audio file to a 16 kHz mono float32 waveform.
+    
+    Args:
+        path: Path to any audio or video file ffmpeg can read
+        
+    Returns:
+        Waveform normalized to [-1, 1]
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", path,
+        "-ar", str(SAMPLE_RATE), "-ac", "1",
+        "-f", "s16le", "-"
+    ]
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE) as proc:
+        out, err = proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"Failed to decode audio: {err.decode(errors='replace').strip()}")
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+
 class VideoRAGService:
     """
     Singleton service for managing video processing and RAG pipeline.
@@ -23,6 +81,19 @@ class VideoRAGService:
     
     _instance = None
     
+    # Videos at least this long (seconds) are transcribed with batched
+    # inference: VAD segments are decoded in groups instead of one by one.
+    # On GPU every video is batched.
+    BATCHED_MIN_DURATION = 600
+    TRANSCRIBE_BATCH_SIZE = 16
+    
+    # Audio shorter than this (seconds) is transcribed with the tiny model
+    SHORT_AUDIO_DURATION = 120
+    
+    # Downloads go to RAM-backed tmpfs when available, up to this size
+    SHM_DIR = "/dev/shm/es2al"
+    SHM_MAX_DOWNLOAD_BYTES = 500 * 1024 * 1024
+    
     def __new__(cls):
         """Implement singleton pattern."""
         if cls._instance is None:
@@ -34,66 +105,296 @@ class VideoRAGService:
         """Initialize the service (only once due to singleton)."""
         if not self._initialized:
             self.pipeline: Optional[RAGPipeline] = None
-            self.whisper_model: Optional[Any] = None
+            # Loaded Whisper models by name, with their batched pipelines
+            self._whisper_models: Dict[str, Tuple[WhisperModel, BatchedInferencePipeline]] = {}
+            self._whisper_lock = threading.Lock()
+            self._whisper_device = self._resolve_whisper_device()
+            self._local_embeddings: Optional[LocalEmbeddingsManager] = None
             self.current_video_url: Optional[str] = None
             self.transcription_text: Optional[str] = None
             self.video_title: Optional[str] = None
+            self._open_transcription_cache()
+            self._open_qa_cache()
+            
+            # One downloader for the service lifetime keeps its extractors
+            # and HTTP session warm; it is not thread-safe, hence the lock.
+            # The native audio stream is kept as-is and decoded once later,
+            # instead of re-encoding it to mp3 first. m4a (AAC) is preferred:
+            # it is a single audio-only file that decodes cheaply, with any
+            # other audio-only stream as the fallback.
+            self._ydl = yt_dlp.YoutubeDL({
+                'format': 'bestaudio[ext=m4a]/bestaudio',
+                'quiet': True,
+                'no_warnings': True,
+            })
+            self._ydl_lock = threading.Lock()
+            self._shm_dir = self._open_shm_dir()
+            
+            # Jobs in progress by video ID; duplicate requests wait on these
+            self._inflight: Dict[str, concurrent.futures.Future] = {}
+            self._inflight_lock = threading.Lock()
+            # Keeps the active pipeline and the answer cache scope in step
+            self._pipeline_lock = threading.Lock()
             self._initialized = True
+            
+            # Load models in the background so the first request skips it
+            threading.Thread(target=self._warm_up, name="warmup", daemon=True).start()
+    
+    def _warm_up(self):
+        """Load Whisper and open the embeddings connection ahead of the first request."""
+        try:
+            # A short decode also initializes the CTranslate2 kernels
+            silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+            for model_name in {settings.model.whisper_model, self._short_audio_model()}:
+                for _ in self._iter_transcription(silence, model_name):
+                    pass
+            
+            if settings.model.embedding_backend == "local" or settings.openai_api_key:
+                self._create_embeddings_manager().embed_query("warmup")
+        except Exception:
+            # Best effort only; real requests load and report errors themselves
+            pass
+    
+    def _open_transcription_cache(self):
+        """Open the SQLite transcription cache, creating its table if needed."""
+        # The connection is shared across request threads; the lock
+        # serializes access to it.
+        self._cache_lock = threading.Lock()
+        self._cache_db = sqlite3.connect(
+            settings.cache.transcription_db,
+            check_same_thread=False
+        )
+        with self._cache_lock, self._cache_db:
+            self._cache_db.execute(
+                "CREATE TABLE IF NOT EXISTS transcriptions ("
+                "video_id TEXT PRIMARY KEY, "
+                "title TEXT, "
+                "transcript TEXT NOT NULL, "
+                "created_at INTEGER NOT NULL)"
+            )
+    
+    def _open_qa_cache(self):
+        """Load the question/answer cache and save it again at exit."""
+        self._qa_cache = SemanticCache(
+            max_entries=settings.cache.qa_cache_size,
+            threshold=settings.cache.qa_similarity_threshold
+        )
+        self._qa_cache.load(settings.cache.qa_cache_path)
+        atexit.register(self._qa_cache.save, settings.cache.qa_cache_path)
     
-    def _load_whisper_model(self):
-        """Load Whisper model lazily."""
-        if self.whisper_model is None:
-            self.whisper_model = whisper.load_model("base")
-        return self.whisper_model
+    def _get_cached_transcription(self, video_id: str) -> Optional[Tuple[str, str]]:
+        """
+        Look up a cached transcription.
+        
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            (title, transcript) tuple, or None on a miss or expired entry
+        """
+        with self._cache_lock:
+            row = self._cache_db.execute(
+                "SELECT title, transcript, created_at FROM transcriptions WHERE video_id = ?",
+                (video_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        title, transcript, created_at = row
+        ttl = settings.cache.transcription_ttl
+        if ttl and time.time() - created_at > ttl:
+            return None
+        return title, transcript
+    
+    def _cache_transcription(self, video_id: str, title: str, transcript: str):
+        """
+        Store a transcription in the cache.
+        
+        Args:
+            video_id: YouTube video ID
+            title: Video title
+            transcript: Transcribed text
+        """
+        with self._cache_lock, self._cache_db:
+            self._cache_db.execute(
+                "INSERT OR REPLACE INTO transcriptions VALUES (?, ?, ?, ?)",
+                (video_id, title, transcript, int(time.time()))
+            )
+    
+    @staticmethod
+    def _resolve_whisper_device() -> str:
+        """Get the configured Whisper device, detecting CUDA when set to "auto"."""
+        device = settings.model.whisper_device
+        if device == "auto":
+            return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+        return device
+    
+    def _load_whisper_model(self, name: str) -> Tuple[WhisperModel, BatchedInferencePipeline]:
+        """
+        Load a Whisper model once (CTranslate2 runtime, int8 weights).
+        
+        On GPU, matmuls run in float16 on the int8 weights.
+        
+        Args:
+            name: Whisper model size or faster-whisper model ID
+            
+        Returns:
+            (model, batched pipeline) tuple
+        """
+        with self._whisper_lock:
+            if name not in self._whisper_models:
+                device = self._whisper_device
+                model = WhisperModel(
+                    name,
+                    device=device,
+                    compute_type="int8_float16" if device == "cuda" else "int8",
+                    cpu_threads=os.cpu_count() or 0,
+                    num_workers=1
+                )
+                self._whisper_models[name] = (model, BatchedInferencePipeline(model=model))
+            return self._whisper_models[name]
+    
+    @staticmethod
+    def _short_audio_model() -> str:
+        """Get the model used for short audio, matching the configured language scope."""
+        return "tiny.en" if settings.model.whisper_model.endswith(".en") else "tiny"
+    
+    def _iter_transcription(
+        self,
+        audio: np.ndarray,
+        model_name: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Transcribe audio, batching the decoder for long videos.
+        
+        Args:
+            audio: 16 kHz mono float32 waveform
+            model_name: Whisper model to use (picked from the audio length if None)
+            
+        Yields:
+            Text of each transcribed segment, as soon as it is decoded
+        """
+        if model_name is None:
+            if len(audio) < self.SHORT_AUDIO_DURATION * SAMPLE_RATE:
+                model_name = self._short_audio_model()
+            else:
+                model_name = settings.model.whisper_model
+        model, batched = self._load_whisper_model(model_name)
+        
+        if self._whisper_device == "cuda" or len(audio) >= self.BATCHED_MIN_DURATION * SAMPLE_RATE:
+            segments, _ = batched.transcribe(
+                audio,
+                beam_size=1,
+                batch_size=self.TRANSCRIBE_BATCH_SIZE
+            )
+        else:
+            segments, _ = model.transcribe(audio, beam_size=1, vad_filter=True)
+        for segment in segments:
+            text = segment.text.strip()
+            if text:
+                yield text
     
     def process_video(self, video_url: str) -> Dict[str, Any]:
         """
         Download, transcribe, and process a YouTube video.
         
+        Synchronous wrapper around process_video_async for callers without
+        a running event loop.
+        
+        Args:
+            video_url: YouTube video URL
+            
+        Returns:
+            Dictionary with processing results and status
+        """
+        return asyncio.run(self.process_video_async(video_url))
+    
+    async def process_video_async(self, video_url: str) -> Dict[str, Any]:
+        """
+        Download, transcribe, and process a YouTube video.
+        
+        Concurrent calls for the same video share a single job and all
+        receive its result.
+        
         Args:
             video_url: YouTube video URL
             
         Returns:
             Dictionary with processing results and status
         """
+        key = _extract_video_id(video_url) or video_url
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                # A running future cannot be cancelled, so a waiter that
+                # gives up does not take the shared result down with it
+                future.set_running_or_notify_cancel()
+                self._inflight[key] = future
+        
+        if not owner:
+            return await asyncio.shield(asyncio.wrap_future(future))
+        
         try:
-            # Download audio using yt-dlp
-            with tempfile.TemporaryDirectory() as tmpdir:
-                audio_file = os.path.join(tmpdir, "audio.%(ext)s")
-                
-                # yt-dlp options
-                ydl_opts = {
-                    'format': 'bestaudio/best',
-                    'outtmpl': audio_file,
-                    'quiet': True,
-                    'no_warnings': True,
-                    'extract_audio': True,
-                    'postprocessors': [{
-                        'key': 'FFmpegExtractAudio',
-                        'preferredcodec': 'mp3',
-                        'preferredquality': '192',
-                    }],
-                }
-                
-                # Download video and extract info
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    info = ydl.extract_info(video_url, download=True)
-                    self.video_title = info.get('title', 'Unknown')
-                    
-                    # Get the actual downloaded file
-                    downloaded_file = os.path.join(tmpdir, "audio.mp3")
-                
-                # Transcribe audio
-                model = self._load_whisper_model()
-                result = model.transcribe(downloaded_file, fp16=False)
-                self.transcription_text = result["text"].strip()
+            result = await self._process_video(video_url)
+            if not future.done():
+                future.set_result(result)
+            return result
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+    
+    async def _process_video(self, video_url: str) -> Dict[str, Any]:
+        """
+        Download, transcribe, and process a YouTube video.
+        
+        Transcription and ingestion overlap: batches of transcript are
+        embedded while Whisper keeps decoding the rest of the audio.
+        
+        Args:
+            video_url: YouTube video URL
+            
+        Returns:
+            Dictionary with processing results and status
+        """
+        try:
+            pipeline = self._create_pipeline()
             
-            # Initialize RAG pipeline
-            self._initialize_pipeline()
+            video_id = _extract_video_id(video_url)
+            cached = self._get_cached_transcription(video_id) if video_id else None
+            store_path = self._vector_cache_path(video_id) if video_id else None
             
-            # Ingest transcription
-            num_chunks = self.pipeline.ingest_documents(text=self.transcription_text)
+            if cached is not None:
+                title, transcription = cached
+                # Reuse the saved embeddings, falling back to a fresh ingest
+                num_chunks = await asyncio.to_thread(pipeline.load, store_path)
+                if not num_chunks:
+                    num_chunks = await asyncio.to_thread(
+                        pipeline.ingest_documents, text=transcription
+                    )
+                    await asyncio.to_thread(pipeline.save, store_path)
+            else:
+                title, transcription, num_chunks = await self._download_transcribe_ingest(
+                    video_url, pipeline
+                )
+                if video_id:
+                    self._cache_transcription(video_id, title, transcription)
+                    await asyncio.to_thread(pipeline.save, store_path)
             
+            # Cached answers only hold for the video and embedding model
+            # they were generated with, so the cache moves to the new scope
+            # before any query can reach the new pipeline
+            scope = f"{self._embedding_model_name()}:{video_id or video_url}"
+            with self._pipeline_lock:
+                if self._qa_cache.scope != scope:
+                    self._qa_cache.clear(scope)
+                self.pipeline = pipeline
+            self.video_title = title
+            self.transcription_text = transcription
             self.current_video_url = video_url
             
             return {
@@ -109,18 +410,132 @@ class VideoRAGService:
                 "error": str(e)
             }
     
-    def _initialize_pipeline(self):
-        """Initialize the RAG pipeline components."""
+    async def _download_transcribe_ingest(
+        self,
+        video_url: str,
+        pipeline: RAGPipeline
+    ) -> Tuple[str, str, int]:
+        """
+        Download, transcribe and ingest a video as overlapping stages.
+        
+        Transcript segments are streamed into the pipeline as Whisper emits
+        them, so embedding runs alongside transcription.
+        
+        Args:
+            video_url: YouTube video URL
+            pipeline: Pipeline to ingest the transcript into
+            
+        Returns:
+            (title, transcription, number of chunks) tuple
+        """
+        # Stage 1: download and decode
+        title, audio = await asyncio.to_thread(self._download_audio, video_url)
+        
+        # Stages 2 and 3: transcribe, embedding finished chunks in the background
+        transcript = []
+        
+        def segments() -> Iterator[str]:
+            for text in self._iter_transcription(audio):
+                transcript.append(text)
+                yield text
+        
+        num_chunks = await asyncio.to_thread(pipeline.ingest_stream, segments())
+        
+        return title, " ".join(transcript), num_chunks
+    
+    def _download_audio(self, video_url: str) -> Tuple[str, np.ndarray]:
+        """
+        Download a video's audio track and decode it.
+        
+        Args:
+            video_url: YouTube video URL
+            
+        Returns:
+            (title, 16 kHz mono waveform) tuple
+        """
+        # Extract info first, to size the download before picking a directory
+        with self._ydl_lock:
+            info = self._ydl.extract_info(video_url, download=False)
+        title = info.get('title', 'Unknown')
+        size = info.get('filesize') or info.get('filesize_approx')
+        
+        # Download audio using yt-dlp
+        with tempfile.TemporaryDirectory(dir=self._download_dir(size)) as tmpdir:
+            audio_file = os.path.join(tmpdir, "audio.%(ext)s")
+            
+            with self._ydl_lock:
+                self._ydl.params['outtmpl']['default'] = audio_file
+                info = self._ydl.process_ie_result(info, download=True)
+                
+                # Get the actual downloaded file
+                downloaded_file = self._ydl.prepare_filename(info)
+            
+            # Decode straight to 16 kHz mono so Whisper works in memory
+            return title, _load_audio(downloaded_file)
+    
+    def _open_shm_dir(self) -> Optional[str]:
+        """Create the tmpfs download directory, or return None if there is no tmpfs."""
+        if not os.path.isdir(os.path.dirname(self.SHM_DIR)):
+            return None
+        try:
+            os.makedirs(self.SHM_DIR, exist_ok=True)
+        except OSError:
+            return None
+        return self.SHM_DIR
+    
+    def _download_dir(self, size: Optional[int]) -> Optional[str]:
+        """
+        Pick the directory to download into.
+        
+        Args:
+            size: Expected download size in bytes, if known
+            
+        Returns:
+            The tmpfs directory if the download fits, else None (system temp dir)
+        """
+        if self._shm_dir is None or not size or size > self.SHM_MAX_DOWNLOAD_BYTES:
+            return None
+        if shutil.disk_usage(self._shm_dir).free < size:
+            return None
+        return self._shm_dir
+    
+    @staticmethod
+    def _embedding_model_name() -> str:
+        """Get the name of the embedding model for the configured backend."""
+        if settings.model.embedding_backend == "local":
+            return settings.model.local_embedding_model
+        return settings.model.embedding_model
+    
+    def _vector_cache_path(self, video_id: str) -> str:
+        """Get where a video's vector store is saved for the current embedding model."""
+        model = self._embedding_model_name().replace("/", "--")
+        return os.path.join(settings.cache.vector_cache_dir, model, video_id)
+    
+    def _create_embeddings_manager(self):
+        """Create the embeddings manager for the configured backend."""
+        if settings.model.embedding_backend == "local":
+            # Shared so the model is only loaded once per process
+            if self._local_embeddings is None:
+                self._local_embeddings = LocalEmbeddingsManager(
+                    model=settings.model.local_embedding_model
+                )
+            return self._local_embeddings
+        return EmbeddingsManager(
+            model=settings.model.embedding_model,
+            api_key=settings.openai_api_key,
+            batch_size=settings.model.embedding_batch_size,
+            max_concurrency=settings.model.embedding_concurrency
+        )
+    
+    def _create_pipeline(self) -> RAGPipeline:
+        """Create a RAG pipeline from the configured components."""
         # Create pipeline components
         doc_processor = DocumentProcessor(
             chunk_size=settings.chunking.chunk_size,
             chunk_overlap=settings.chunking.chunk_overlap
         )
         
-        embeddings_manager = EmbeddingsManager(
-            model=settings.model.embedding_model,
-            api_key=settings.openai_api_key
-        )
+        embeddings_manager = self._create_embeddings_manager()
         
         llm_client = LLMClient(
             model=settings.model.llm_model,
@@ -130,13 +545,14 @@ class VideoRAGService:
         )
         
         # Create pipeline
-        self.pipeline = RAGPipeline(
+        return RAGPipeline(
             document_processor=doc_processor,
             embeddings_manager=embeddings_manager,
             vector_store_type=settings.vector_store.store_type,
             llm_client=llm_client,
             index_name=settings.vector_store.index_name,
-            top_k=settings.vector_store.top_k
+            top_k=settings.vector_store.top_k,
+            vector_store_kwargs=settings.vector_store.store_kwargs()
         )
     
     def query(self, question: str) -> Dict[str, Any]:
@@ -149,7 +565,11 @@ class VideoRAGService:
         Returns:
             Dictionary with answer and status
         """
-        if self.pipeline is None:
+        with self._pipeline_lock:
+            pipeline = self.pipeline
+            scope = self._qa_cache.scope
+        
+        if pipeline is None:
             return {
                 "success": False,
                 "answer": "",
@@ -157,7 +577,28 @@ class VideoRAGService:
             }
         
         try:
-            answer = self.pipeline.query(question)
+            answer = self._qa_cache.get_exact(question)
+            if answer is not None:
+                return {
+                    "success": True,
+                    "answer": answer,
+                    "cache": "exact"
+                }
+            
+            # The embedding is cached by the manager, so retrieval below
+            # reuses it instead of embedding the question twice
+            embedding = pipeline.embeddings.embed_query(question)
+            answer = self._qa_cache.get_similar(embedding)
+            if answer is not None:
+                return {
+                    "success": True,
+                    "answer": answer,
+                    "cache": "semantic"
+                }
+            
+            answer = pipeline.query(question)
+            # Dropped if another video was processed while this one answered
+            self._qa_cache.put(question, embedding, answer, scope)
             return {
                 "success": True,
                 "answer": answer
@@ -169,10 +610,35 @@ class VideoRAGService:
                 "error": str(e)
             }
     
+    async def stream_query(self, question: str) -> AsyncIterator[str]:
+        """
+        Answer a question, streaming the answer as it is generated.
+        
+        Args:
+            question: User question
+            
+        Yields:
+            Answer text fragments
+            
+        Raises:
+            ValueError: If no video has been processed yet
+        """
+        if self.pipeline is None:
+            raise ValueError("No video has been processed yet. Please process a video first.")
+        
+        async for token in self.pipeline.stream_query(question):
+            yield token
+    
     def search_chunks(self, query: str, num_chunks: int = 3) -> Dict[str, Any]:
         """
         Search for similar document chunks.
         
+        The /search route serializes the result as-is, without validating
+        it, so chunk metadata must stay JSON-safe (str/int/float/bool/None,
+        lists and dicts of those). Every store in this tree guarantees
+        that: metadata comes from DocumentProcessor, JSON round-trips
+        through saved stores, or comes back from Pinecone as JSON.
+        
         Args:
             query: Search query
             num_chunks: Number of chunks to retrieve